@@ -5,35 +5,63 @@
     python scripts/build_notes.py
 
 依赖：
-    可选依赖 `markdown` 库，用于更完整的 Markdown 转 HTML 解析。
-    若未安装，会退回到简单的内置解析器。
+    可选依赖 `markdown` 库，用于更完整的 Markdown 转 HTML 解析；
+    其次可用 `markdown-it-py`。两者都未安装时，会退回到简单的内置解析器。
+    安装了 `orjson` 时用它读写 JSON（front matter 列表与构建缓存），否则使用标准库。
 """
 from __future__ import annotations
 
 import argparse
+import collections
 import datetime as dt
+import functools
+import hashlib
 import html
+import importlib.util
+import io
 import json
+import os
 import re
+import string
+import subprocess
 import sys
-import textwrap
 import unicodedata
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import List
+from typing import Callable, List, Optional, Union
+
+# 可选依赖：装了 orjson 就用它读写 JSON，否则用标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ---------------------------------------------------------------------------
 # 路径常量
 # ---------------------------------------------------------------------------
 BASE_DIR = Path(__file__).resolve().parent.parent
 MARKDOWN_DIR = BASE_DIR / "markdown 文章"
+MARKDOWN_SUFFIXES = (".md", ".markdown")
 NOTES_FILE = BASE_DIR / "basics.html"
 PAPERS_FILE = BASE_DIR / "papers.html"
 PATHWAYS_FILE = BASE_DIR / "pathways-methods.html"
 STORIES_FILE = BASE_DIR / "stories-evolution.html"
 NOTE_OUTPUT_DIR = BASE_DIR / "notes"
+# 构建缓存统一放在 .cache/ 下：文章索引与正文 HTML 的内容寻址缓存（<hash>.html）
+CACHE_DIR = BASE_DIR / ".cache"
+CACHE_FILE = CACHE_DIR / "notes_index.json"
+HTML_CACHE_DIR = CACHE_DIR / "md-html"
+# 旧版本放在 notes/ 下的索引，写新索引时顺手删除
+LEGACY_CACHE_FILE = NOTE_OUTPUT_DIR / ".cache.json"
 PLACEHOLDER_START = "<!-- BEGIN:ARTICLE_LIST -->"
 PLACEHOLDER_END = "<!-- END:ARTICLE_LIST -->"
+# 文章数达到该值时才启用多进程解析
+PARALLEL_THRESHOLD = 8
+# 写文件的线程数（磁盘 I/O 会释放 GIL）
+WRITE_WORKERS = 8
+# 超过该字符数的正文不进内存缓存，避免长文占住内存
+MEMO_MAX_CHARS = 200_000
 
 # 板块映射
 CATEGORY_MAP = {
@@ -43,18 +71,41 @@ CATEGORY_MAP = {
     "stories": ("stories-evolution.html", "Stories & Evolution｜人类演化 & 疾病小随笔", "hero-sub--stories", "Stories"),
 }
 
-try:
-    import markdown  # type: ignore
-except ImportError:  # pragma: no cover
-    markdown = None
+# 详情页导航：(链接, 文字, 对应板块)
+NOTE_NAV_LINKS = (
+    ("../index.html", "首页", None),
+    ("../papers.html", CATEGORY_MAP["papers"][1], "papers"),
+    ("../pathways-methods.html", CATEGORY_MAP["pathways"][1], "pathways"),
+    ("../basics.html", CATEGORY_MAP["basics"][1], "basics"),
+    ("../stories-evolution.html", CATEGORY_MAP["stories"][1], "stories"),
+    ("../contact.html", "联系我", None),
+)
+
+BACK_TEXT_MAP = {
+    "basics": "← 返回基础概念列表",
+    "papers": "← 返回论文拆解列表",
+    "pathways": "← 返回通路与方法区列表",
+    "stories": "← 返回人类演化 & 疾病小随笔列表",
+}
+
+# 可选解析器按优先级排列：(模块名, 发行包名)。首次真正需要转换时才导入
+OPTIONAL_PARSERS = (("markdown", "Markdown"), ("markdown_it", "markdown-it-py"))
+MARKDOWN_EXTENSIONS = ("fenced_code", "tables", "toc", "sane_lists")
+# 调整外部解析器的调用方式（扩展之外的选项、markdown-it 预设等）时递增，使正文 HTML 缓存失效
+HTML_CACHE_VERSION = 1
 
 # ---------------------------------------------------------------------------
 # 数据结构
 # ---------------------------------------------------------------------------
 
-@dataclass(order=True)
+# 日期、标签、meta 行在文章之间大量重复，转义结果按字符串缓存
+_esc = functools.lru_cache(maxsize=4096)(html.escape)
+
+ISO_DATE_PATTERN = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+
+@dataclass
 class Note:
-    sort_index: dt.datetime = field(init=False, repr=False)
     title: str
     date_display: str
     summary: str
@@ -62,41 +113,94 @@ class Note:
     slug: str
     html_body: str
     category: str = "basics"  # 默认分类为 basics
+    # 以下为派生字段：构造时转义一次，列表页与详情页渲染时直接复用
+    escaped_title: str = field(init=False, repr=False, compare=False)
+    escaped_slug: str = field(init=False, repr=False, compare=False)
+    escaped_summary: str = field(init=False, repr=False, compare=False)
+    escaped_meta_line: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        try:
-            self.sort_index = dt.datetime.strptime(self.date_display, "%Y-%m-%d")
-        except ValueError:
-            # 未注明日期或格式不标准时排在最旧
-            self.sort_index = dt.datetime.min
+        tags_text = "，".join(self.tags) if self.tags else "暂无标签"
+        self.escaped_title = html.escape(self.title)
+        self.escaped_slug = html.escape(self.slug)
+        self.escaped_summary = html.escape(self.summary)
+        self.escaped_meta_line = _esc(f"{self.date_display} · {tags_text}")
+
+
+@functools.lru_cache(maxsize=None)
+def date_sort_key(date_display: str) -> dt.datetime:
+    """把日期文本解析为排序键，同一日期只解析一次；未注明日期或格式不标准时排在最旧。"""
+    try:
+        # 规范的 YYYY-MM-DD 走 C 实现的 fromisoformat；其余写法（如 2024-1-2）仍交给 strptime
+        if ISO_DATE_PATTERN.fullmatch(date_display):
+            return dt.datetime.fromisoformat(date_display)
+        return dt.datetime.strptime(date_display, "%Y-%m-%d")
+    except ValueError:
+        return dt.datetime.min
+
+
+def note_sort_key(note: Note) -> tuple:
+    """先按日期，日期相同时依次比较其余字段（与原先 order=True 的比较顺序一致）。"""
+    return (
+        date_sort_key(note.date_display),
+        note.title,
+        note.date_display,
+        note.summary,
+        note.tags,
+        note.slug,
+        note.html_body,
+        note.category,
+    )
 
 # ---------------------------------------------------------------------------
 # Markdown 元信息解析
 # ---------------------------------------------------------------------------
 
-FRONT_MATTER_PATTERN = re.compile(r"^(?P<key>[A-Za-z_][A-Za-z0-9_-]*):\s*(?P<value>.+)$")
+# 在整段 front matter 上按行匹配：行首尾空白不计入，值为冒号后首个到最后一个非空白字符
+FRONT_MATTER_PATTERN = re.compile(
+    r"^[^\S\n]*(?P<key>[A-Za-z_][A-Za-z0-9_-]*):[^\S\n]*(?P<value>\S(?:[^\n]*\S)?)[^\S\n]*$",
+    re.MULTILINE,
+)
 DATE_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})")
+TAG_SPLIT_PATTERN = re.compile(r"[,，、]")
+
+
+def _json_loads(text: Union[str, bytes]):
+    """优先用 orjson 解析；orjson 不接受的写法（如 NaN）再交给 json 重试。"""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
 
 
 def parse_front_matter(lines: List[str]) -> dict:
+    """解析 front matter 行。一次 finditer 扫描全部行；列表值只有带双引号时才交给 json。"""
     meta = {}
-    for line in lines:
-        match = FRONT_MATTER_PATTERN.match(line.strip())
-        if not match:
-            continue
-        key = match.group("key").lower()
-        value = match.group("value").strip()
+    for match in FRONT_MATTER_PATTERN.finditer("\n".join(lines)):
+        key, value = match.group("key", "value")
+        key = key.lower()
         if value.startswith("[") and value.endswith("]"):
-            try:
-                meta[key] = json.loads(value)
-            except json.JSONDecodeError:
-                meta[key] = [v.strip() for v in re.split(r"[,，、]", value.strip("[]")) if v.strip()]
+            if '"' in value:
+                try:
+                    meta[key] = _json_loads(value)
+                    continue
+                except ValueError:
+                    pass
+            meta[key] = [v.strip() for v in TAG_SPLIT_PATTERN.split(value.strip("[]")) if v.strip()]
         else:
             meta[key] = value
     return meta
 
 
-def extract_meta(text: str, path: Path) -> tuple[dict, str]:
+def extract_meta(text: str, path: Path) -> tuple[dict, List[str], str]:
+    """解析元信息，并在同一遍扫描中得到正文行与摘要候选文本。
+
+    返回 ``(meta, body_lines, first_paragraph)``：``body_lines`` 去掉了含 date/tags/title
+    的引用行及首尾空白；空行、引用行与标题行都视作段落分隔，``first_paragraph`` 为其后第一段，
+    用于生成摘要，收集完第一段就不再记录。
+    """
     lines = text.splitlines()
     meta = {}
     body_start = 0
@@ -112,49 +216,99 @@ def extract_meta(text: str, path: Path) -> tuple[dict, str]:
     else:
         body_start = 0
 
+    need_title = "title" not in meta
+    # 绝大多数行原样保留：先整体切片，只记下要去掉的元信息引用行
     body_lines = lines[body_start:]
+    dropped: List[int] = []
+    summary_lines: List[str] = []
+    summary_done = False
+    # 日期 / 标签 / 摘要都已确定后，引用行不必再逐个检查关键词
+    quote_meta_done = {"date", "tags", "summary"} <= meta.keys()
+    for offset, line in enumerate(body_lines):
+        stripped = line.strip()
+        # 标题：取第一个一级标题
+        if need_title and line.startswith("# "):
+            meta["title"] = line[2:].strip()
+            need_title = False
+
+        if stripped.startswith(">"):
+            # 解析 blockquote 元信息
+            if not quote_meta_done:
+                clean = line.lstrip("> ")
+                if "日期" in clean and "date" not in meta:
+                    date_match = DATE_PATTERN.search(clean)
+                    if date_match:
+                        meta["date"] = date_match.group(1)
+                if "标签" in clean and "tags" not in meta:
+                    tag_part = clean.split("：", 1)[-1]
+                    meta["tags"] = [t.strip() for t in TAG_SPLIT_PATTERN.split(tag_part) if t.strip()]
+                if "摘要" in clean and "summary" not in meta:
+                    meta["summary"] = clean.split("：", 1)[-1].strip()
+                quote_meta_done = {"date", "tags", "summary"} <= meta.keys()
+            summary_done = summary_done or bool(summary_lines)
+            if "date" in stripped or "tags" in stripped or "title" in stripped:
+                dropped.append(offset)
+            continue
 
-    # 标题
-    if "title" not in meta:
-        for line in body_lines:
-            if line.startswith("# "):
-                meta["title"] = line[2:].strip()
-                break
-        else:
-            meta["title"] = path.stem
+        if not stripped or stripped.startswith("#"):
+            summary_done = summary_done or bool(summary_lines)
+        elif not summary_done:
+            summary_lines.append(line)
 
-    # 解析 blockquote 元信息
-    for line in body_lines:
-        if not line.lstrip().startswith(">"):  # 非引用行忽略
-            continue
-        clean = line.lstrip("> ")
-        if "日期" in clean and "date" not in meta:
-            date_match = DATE_PATTERN.search(clean)
-            if date_match:
-                meta["date"] = date_match.group(1)
-        if "标签" in clean and "tags" not in meta:
-            tag_part = clean.split("：", 1)[-1]
-            meta["tags"] = [t.strip() for t in re.split(r"[,，、]", tag_part) if t.strip()]
-        if "摘要" in clean and "summary" not in meta:
-            meta["summary"] = clean.split("：", 1)[-1].strip()
+    if dropped:
+        dropped_set = set(dropped)
+        body_lines = [line for offset, line in enumerate(body_lines) if offset not in dropped_set]
 
+    if need_title:
+        meta["title"] = path.stem
     if "tags" not in meta:
         meta["tags"] = []
 
-    return meta, "\n".join(body_lines)
+    return meta, trim_blank_lines(body_lines), "\n".join(summary_lines).strip()
+
+
+def trim_blank_lines(lines: List[str]) -> List[str]:
+    """去掉首尾空白行及首行行首、末行行尾的空白，与对整段文本 strip() 等价。"""
+    start, end = 0, len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    trimmed = lines[start:end]
+    if trimmed:
+        trimmed[0] = trimmed[0].lstrip()
+        trimmed[-1] = trimmed[-1].rstrip()
+    return trimmed
 
 # ---------------------------------------------------------------------------
 # Markdown 转 HTML
 # ---------------------------------------------------------------------------
 
-LIST_ITEM_PATTERN = re.compile(r"^\s*([*+-]|\d+[.)])\s+")
-HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*)$")
-BLOCKQUOTE_PATTERN = re.compile(r"^>\s?(.*)$")
-HORIZONTAL_RULE_PATTERN = re.compile(r"^\s*([-*_])\s*\1\s*\1\s*$")
+# 水平线与列表合并为一个分支正则，按顺序尝试，命中的分支名即 lastgroup；
+# 标题与引用必须从行首开始，直接用字符串判断
+LINE_PATTERN = re.compile(
+    r"^(?:"
+    r"(?P<hr>\s*(?P<rule>[-*_])\s*(?P=rule)\s*(?P=rule)\s*)"
+    r"|(?P<item>\s*(?P<marker>[*+-]|\d+[.)])\s+(?P<itext>.*))"
+    r")$"
+)
+# 预先拼好的标签，逐行输出时不必再格式化层级数字
+HEADING_TAGS = [(f"<h{level}>", f"</h{level}>\n") for level in range(7)]
+LIST_TAGS = {tag: (f"<{tag}>\n", f"</{tag}>\n") for tag in ("ul", "ol")}
+# LINE_PATTERN 各分支可能的首个非空白字符（另加十进制数字，见 _may_start_block）
+BLOCK_START_CHARS = frozenset("-*_+")
 TABLE_ROW_PATTERN = re.compile(r"^\s*\|(.+)\|\s*$")
 TABLE_SEPARATOR_PATTERN = re.compile(r"^\s*\|[\s\-:|]+\|\s*$")
-LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^\)]+)\)")
 IMAGE_PATTERN = re.compile(r"!\[([^\]]*)\]\(([^\)]+)\)")
+# 行内图片优先于链接，与先替换图片、再替换链接的顺序一致
+INLINE_PATTERN = re.compile(
+    r"(?P<image>!\[(?P<alt>[^\]]*)\]\((?P<src>[^\)]+)\))"
+    r"|(?P<link>\[(?P<text>[^\]]+)\]\((?P<href>[^\)]+)\))"
+)
+
+
+def _may_start_block(first: str) -> bool:
+    return first in BLOCK_START_CHARS or first.isdecimal()
 
 
 def parse_table_row(line: str) -> List[str]:
@@ -165,114 +319,99 @@ def parse_table_row(line: str) -> List[str]:
     return cells
 
 
-def is_table_separator(line: str) -> bool:
-    """判断是否是表格分隔符行"""
-    return bool(TABLE_SEPARATOR_PATTERN.match(line))
-
-
-def simple_markdown_to_html(text: str) -> str:
-    """极简 Markdown 解析器，覆盖标题、引用、列表、段落、表格。"""
-    lines = text.splitlines()
-    html_parts: List[str] = []
+def convert_links_in_text(text: str) -> str:
+    """处理行内 Markdown（图片和链接），一次扫描完成匹配与转义。"""
+    out: List[str] = []
+    last = 0
+    for match in INLINE_PATTERN.finditer(text):
+        out.append(html.escape(text[last:match.start()]))
+        if match.lastgroup == "image":
+            escaped_alt = html.escape(match.group("alt"))
+            escaped_url = html.escape(match.group("src"))
+            out.append(f'<img src="{escaped_url}" alt="{escaped_alt}" style="max-width: 100%; height: auto;">')
+        else:
+            escaped_text = html.escape(match.group("text"))
+            escaped_url = html.escape(match.group("href"))
+            out.append(f'<a href="{escaped_url}">{escaped_text}</a>')
+        last = match.end()
+    out.append(html.escape(text[last:]))
+    return "".join(out)
+
+
+def simple_markdown_to_html(text: Union[str, List[str]]) -> str:
+    """极简 Markdown 解析器，覆盖标题、引用、列表、段落、表格。可直接传入按行切好的列表。"""
+    lines = text.splitlines() if isinstance(text, str) else text
+    # 每个块写入时自带换行，最后去掉末尾换行，结果与逐行 "\n".join 相同
+    buf = io.StringIO()
+    write = buf.write
     list_stack: List[str] = []
     in_blockquote = False
     paragraph_lines: List[str] = []
     table_rows: List[List[str]] = []
     in_table = False
-
-    def process_inline_markdown(text: str) -> str:
-        """处理行内 Markdown，如链接和图片"""
-        # 使用占位符方法：先标记链接和图片位置，转义后替换
-        link_placeholders = []
-        image_placeholders = []
-        
-        def replace_link_with_placeholder(match):
-            link_text = match.group(1)
-            link_url = match.group(2)
-            placeholder = f"__LINK_PLACEHOLDER_{len(link_placeholders)}__"
-            link_placeholders.append((placeholder, link_text, link_url))
-            return placeholder
-        
-        def replace_image_with_placeholder(match):
-            alt_text = match.group(1)
-            image_url = match.group(2)
-            placeholder = f"__IMAGE_PLACEHOLDER_{len(image_placeholders)}__"
-            image_placeholders.append((placeholder, alt_text, image_url))
-            return placeholder
-        
-        # 在转义前先标记所有图片和链接
-        text_with_placeholders = IMAGE_PATTERN.sub(replace_image_with_placeholder, text)
-        text_with_placeholders = LINK_PATTERN.sub(replace_link_with_placeholder, text_with_placeholders)
-        # 转义所有 HTML 特殊字符
-        text = html.escape(text_with_placeholders)
-        # 恢复图片（使用转义后的占位符）
-        for placeholder, alt_text, image_url in image_placeholders:
-            escaped_alt = html.escape(alt_text)
-            escaped_url = html.escape(image_url)
-            escaped_placeholder = html.escape(placeholder)
-            text = text.replace(escaped_placeholder, f'<img src="{escaped_url}" alt="{escaped_alt}" style="max-width: 100%; height: auto;">')
-        # 恢复链接（使用转义后的占位符）
-        for placeholder, link_text, link_url in link_placeholders:
-            escaped_text = html.escape(link_text)
-            escaped_url = html.escape(link_url)
-            escaped_placeholder = html.escape(placeholder)
-            text = text.replace(escaped_placeholder, f'<a href="{escaped_url}">{escaped_text}</a>')
-        return text
+    # 预编译正则的 match 方法绑定为局部变量，逐行循环里省去属性查找
+    match_separator = TABLE_SEPARATOR_PATTERN.match
+    match_table_row = TABLE_ROW_PATTERN.match
+    match_block = LINE_PATTERN.match
+    match_image = IMAGE_PATTERN.match
 
     def flush_paragraph() -> None:
         if paragraph_lines:
             paragraph = " ".join(paragraph_lines).strip()
             if paragraph:
-                processed = process_inline_markdown(paragraph)
-                html_parts.append(f"<p>{processed}</p>")
+                processed = convert_links_in_text(paragraph)
+                write(f"<p>{processed}</p>\n")
             paragraph_lines.clear()
 
     def flush_table() -> None:
         if not table_rows:
             return
-        html_parts.append("<table>")
+        write("<table>\n")
         # 第一行是表头
         if table_rows:
-            html_parts.append("  <thead>")
-            html_parts.append("    <tr>")
+            write("  <thead>\n")
+            write("    <tr>\n")
             for cell in table_rows[0]:
-                processed_cell = process_inline_markdown(cell)
-                html_parts.append(f"      <th>{processed_cell}</th>")
-            html_parts.append("    </tr>")
-            html_parts.append("  </thead>")
-            html_parts.append("  <tbody>")
-            # 后续行是数据行
+                processed_cell = convert_links_in_text(cell)
+                write(f"      <th>{processed_cell}</th>\n")
+            write("    </tr>\n")
+            write("  </thead>\n")
+            write("  <tbody>\n")
+            # 后续行是数据行；每行的单元格拼成一次写入
+            escape = html.escape
             for row in table_rows[1:]:
-                html_parts.append("    <tr>")
-                for cell in row:
-                    html_parts.append(f"      <td>{html.escape(cell)}</td>")
-                html_parts.append("    </tr>")
-            html_parts.append("  </tbody>")
-        html_parts.append("</table>")
+                write("    <tr>\n")
+                write("".join([f"      <td>{escape(cell)}</td>\n" for cell in row]))
+                write("    </tr>\n")
+            write("  </tbody>\n")
+        write("</table>\n")
         table_rows.clear()
 
     def close_lists(to_level: int = 0) -> None:
         while len(list_stack) > to_level:
             tag = list_stack.pop()
-            html_parts.append(f"</{tag}>")
+            write(LIST_TAGS[tag][1])
 
     for raw in lines:
         line = raw.rstrip()
-        
+        stripped = line.lstrip()
+        # 块类型几乎只由首个非空白字符决定，先按首字符筛掉不可能命中的正则
+        first = stripped[:1]
+
         # 先检查是否是表格分隔符行（必须在表格行检查之前）
-        if is_table_separator(line):
+        if first == "|" and match_separator(line):
             # 表格分隔符行，跳过
             continue
         
         # 检查是否是表格行
-        if TABLE_ROW_PATTERN.match(line):
+        if first == "|" and match_table_row(line):
             cells = parse_table_row(line)
             if cells:
                 if not in_table:
                     flush_paragraph()
                     close_lists()
                     if in_blockquote:
-                        html_parts.append("</blockquote>")
+                        write("</blockquote>\n")
                         in_blockquote = False
                     in_table = True
                 table_rows.append(cells)
@@ -283,72 +422,83 @@ def simple_markdown_to_html(text: str) -> str:
                 flush_table()
                 in_table = False
         
-        if not line.strip():
+        if not first:
             flush_paragraph()
             close_lists()
             if in_blockquote:
-                html_parts.append("</blockquote>")
+                write("</blockquote>\n")
                 in_blockquote = False
             continue
 
-        if HORIZONTAL_RULE_PATTERN.match(line):
+        # 按行首字符分派：标题、引用手工判断，水平线 / 列表一次匹配后按 lastgroup 区分
+        block = None
+        lead = line[:1]
+        if lead == "#":
+            level = len(line) - len(line.lstrip("#"))
+            kind = "heading" if level <= 6 and line[level:level + 1].isspace() else None
+        elif lead == ">":
+            kind = "quote"
+        elif _may_start_block(first):
+            block = match_block(line)
+            kind = block.lastgroup if block else None
+        else:
+            kind = None
+
+        if kind == "hr":
             flush_paragraph()
             close_lists()
             if in_blockquote:
-                html_parts.append("</blockquote>")
+                write("</blockquote>\n")
                 in_blockquote = False
-            html_parts.append("<hr>")
+            write("<hr>\n")
             continue
 
-        heading = HEADING_PATTERN.match(line)
-        if heading:
+        if kind == "heading":
             flush_paragraph()
             close_lists()
             if in_blockquote:
-                html_parts.append("</blockquote>")
+                write("</blockquote>\n")
                 in_blockquote = False
-            level = len(heading.group(1))
-            content = heading.group(2).strip()
-            html_parts.append(f"<h{level}>{html.escape(content)}</h{level}>")
+            content = line[level:].strip()
+            open_tag, close_tag = HEADING_TAGS[level]
+            write(f"{open_tag}{html.escape(content)}{close_tag}")
             continue
 
-        blockquote = BLOCKQUOTE_PATTERN.match(line)
-        if blockquote:
+        if kind == "quote":
             flush_paragraph()
             close_lists()
             if not in_blockquote:
-                html_parts.append("<blockquote>")
+                write("<blockquote>\n")
                 in_blockquote = True
-            processed_quote = process_inline_markdown(blockquote.group(1).strip())
-            html_parts.append(f"  <p>{processed_quote}</p>")
+            processed_quote = convert_links_in_text(line[1:].strip())
+            write(f"  <p>{processed_quote}</p>\n")
             continue
 
-        list_match = LIST_ITEM_PATTERN.match(line)
-        if list_match:
-            marker = list_match.group(1)
+        if kind == "item":
+            marker = block.group("marker")
             list_type = "ol" if marker[0].isdigit() else "ul"
             if not list_stack or list_stack[-1] != list_type:
                 close_lists(0)
-                html_parts.append(f"<{list_type}>")
+                write(LIST_TAGS[list_type][0])
                 list_stack.append(list_type)
-            item_text = line[list_match.end():].strip()
-            processed_item = process_inline_markdown(item_text)
-            html_parts.append(f"  <li>{processed_item}</li>")
+            item_text = block.group("itext").strip()
+            processed_item = convert_links_in_text(item_text)
+            write(f"  <li>{processed_item}</li>\n")
             continue
 
         # 检查是否是独立的图片行
-        image_match = IMAGE_PATTERN.match(line.strip())
+        image_match = match_image(stripped) if first == "!" else None
         if image_match:
             flush_paragraph()
             close_lists()
             if in_blockquote:
-                html_parts.append("</blockquote>")
+                write("</blockquote>\n")
                 in_blockquote = False
             alt_text = image_match.group(1)
             image_url = image_match.group(2)
             escaped_alt = html.escape(alt_text)
             escaped_url = html.escape(image_url)
-            html_parts.append(f'<p><img src="{escaped_url}" alt="{escaped_alt}" style="max-width: 100%; height: auto;"></p>')
+            write(f'<p><img src="{escaped_url}" alt="{escaped_alt}" style="max-width: 100%; height: auto;"></p>\n')
             continue
 
         paragraph_lines.append(line)
@@ -359,37 +509,100 @@ def simple_markdown_to_html(text: str) -> str:
     flush_paragraph()
     close_lists()
     if in_blockquote:
-        html_parts.append("</blockquote>")
+        write("</blockquote>\n")
+
+    return buf.getvalue().rstrip("\n")
+
+
+@functools.lru_cache(maxsize=1)
+def _selected_parser() -> Optional[tuple[str, str]]:
+    """按 OPTIONAL_PARSERS 的顺序挑出第一个已安装的解析器 ``(模块名, 发行包名)``，都没有时返回 None。
+
+    只用 find_spec 查找、不导入。_get_renderer 与 _parser_name 共用这一规则，
+    缓存盐里记下的解析器与实际渲染正文的解析器才不会不一致。
+    """
+    for module_name, dist_name in OPTIONAL_PARSERS:
+        if importlib.util.find_spec(module_name) is not None:
+            return module_name, dist_name
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _get_renderer() -> Optional[Callable[[str], str]]:
+    """延迟导入选中的解析器，返回 ``source -> html`` 的函数；选用内置解析器时返回 None。
+
+    全部命中缓存的构建不会走到这里，也就不用付出导入扩展的开销。选中的解析器导入失败时直接报错，
+    不悄悄换用下一个，以免正文被缓存在错误的解析器名下。
+    """
+    selected = _selected_parser()
+    if selected is None:
+        return None
+    if selected[0] == "markdown":  # pragma: no cover - 外部依赖
+        import markdown  # type: ignore
+
+        # 扩展只初始化一次，之后每篇 reset() 后复用同一个实例
+        converter = markdown.Markdown(extensions=list(MARKDOWN_EXTENSIONS))
+        return lambda source: converter.reset().convert(source)
+
+    import markdown_it  # type: ignore  # pragma: no cover - 外部依赖
+
+    return markdown_it.MarkdownIt("commonmark").enable("table").render  # pragma: no cover - 外部依赖
+
+
+def _convert_markdown(text: Union[str, tuple]) -> str:
+    render = _get_renderer()
+    if render is None:
+        return simple_markdown_to_html(text)
+    return render(text if isinstance(text, str) else "\n".join(text))
 
-    return "\n".join(html_parts)
 
+# 同一进程内相同正文只转换一次（行列表转成元组作为键）
+_convert_markdown_cached = functools.lru_cache(maxsize=512)(_convert_markdown)
 
-def markdown_to_html(text: str) -> str:
-    if markdown is not None:  # pragma: no cover - 外部依赖
-        return markdown.markdown(
-            text,
-            extensions=["fenced_code", "tables", "toc", "sane_lists"]
-        )
-    return simple_markdown_to_html(text)
+
+def markdown_to_html(text: Union[str, List[str]]) -> str:
+    """``text`` 可以是字符串或行列表；内置解析器直接使用行列表，省去拼接再切分。"""
+    if isinstance(text, str):
+        source, size = text, len(text)
+    else:
+        source = tuple(text)
+        size = sum(map(len, source))
+    if size < MEMO_MAX_CHARS:
+        return _convert_markdown_cached(source)
+    return _convert_markdown(source)
 
 # ---------------------------------------------------------------------------
 # 工具函数
 # ---------------------------------------------------------------------------
 
-NON_ASCII_PATTERN = re.compile(r"[^a-z0-9-]")
+# ASCII 范围内的 slug 映射：字母转小写，数字保留，其余字符（含连字符本身）映射为连字符
+_SLUG_TABLE = {code: chr(code).lower() if chr(code).isalnum() else "-" for code in range(128)}
 MULTI_HYPHEN_PATTERN = re.compile(r"-+")
+# 行内代码（保留内容）与强调符号合成一次扫描；代码内的强调符号一并去掉，与先去反引号再去强调符号的结果相同
+STRIP_INLINE_PATTERN = re.compile(r"`([^`]+)`|[*_~]")
+_EMPHASIS_TABLE = str.maketrans("", "", "*_~")
+# 行首规则必须在行内规则之后依次执行：前一步去掉的符号可能让后一步在行首匹配（如 "**- item**"）
+STRIP_LINE_PATTERNS = (
+    re.compile(r"^>\s?", re.MULTILINE),
+    re.compile(r"^#{1,6}\s+", re.MULTILINE),
+    re.compile(r"^[-*+]\s+", re.MULTILINE),
+    re.compile(r"^\s*([-*_])\s*\1\s*\1\s*$", re.MULTILINE),
+)
+# 上述每条规则都至少含其中一个字符
+STRIP_TRIGGER_PATTERN = re.compile(r"[`*_~>#+-]")
 
 
 def _normalize_slug(text: str) -> str:
-    ascii_text = (
-        unicodedata.normalize("NFKD", text)
-        .encode("ascii", "ignore")
-        .decode("ascii")
-        .lower()
-    )
-    ascii_text = NON_ASCII_PATTERN.sub("-", ascii_text)
-    ascii_text = MULTI_HYPHEN_PATTERN.sub("-", ascii_text).strip("-")
-    return ascii_text
+    # 纯 ASCII 文本做 NFKD 不会有变化，直接查表；其余先分解再丢弃非 ASCII 字符
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+        if not text:  # 纯中文等情况什么也不剩，直接交给 slugify 的兜底
+            return ""
+    text = text.translate(_SLUG_TABLE)
+    # 常见的 kebab-case 文件名没有连续连字符，省去一次正则替换
+    if "--" in text:
+        text = MULTI_HYPHEN_PATTERN.sub("-", text)
+    return text.strip("-")
 
 
 def slugify(value: str, fallback_seed: str, sequence: int) -> str:
@@ -399,151 +612,224 @@ def slugify(value: str, fallback_seed: str, sequence: int) -> str:
     fallback = _normalize_slug(fallback_seed)
     if fallback:
         return fallback
-    hash_part = fallback_seed.encode("utf-8", "ignore").hex()[:8]
-    if hash_part:
-        return f"note-{hash_part}"
+    # 用种子的哈希而不是 UTF-8 编码前缀，开头相同的中文标题不会撞到同一个 slug
+    seed_bytes = fallback_seed.encode("utf-8", "ignore")
+    if seed_bytes:
+        return f"note-{hashlib.blake2b(seed_bytes, digest_size=4).hexdigest()}"
     return f"note-{sequence:03d}"
 
 
 def strip_markdown(text: str) -> str:
-    text = re.sub(r"`([^`]+)`", r"\1", text)
-    text = re.sub(r"[*_~]", "", text)
-    text = re.sub(r"^>\s?", "", text, flags=re.MULTILINE)
-    text = re.sub(r"^#{1,6}\s+", "", text, flags=re.MULTILINE)
-    text = re.sub(r"^[-*+]\s+", "", text, flags=re.MULTILINE)
-    text = re.sub(r"^\s*([-*_])\s*\1\s*\1\s*$", "", text, flags=re.MULTILINE)
+    """去掉摘要中的 Markdown 标记。
+
+    >>> [strip_markdown(t) for t in ["**- item**", "_# x_", "`#` 开头", "- ---", "a `*b*` c"]]
+    ['item', 'x', '开头', '', 'a b c']
+    """
+    # 多数摘要是不带标记的纯文本，先用字符类找触发字符，没有就不必跑正则
+    if not STRIP_TRIGGER_PATTERN.search(text):
+        return text
+    text = STRIP_INLINE_PATTERN.sub(lambda m: (m.group(1) or "").translate(_EMPHASIS_TABLE), text)
+    for pattern in STRIP_LINE_PATTERNS:
+        text = pattern.sub("", text)
     return text
 
 
-def collect_notes() -> List[Note]:
+def read_markdown(path: Path) -> str:
+    """一次读入字节并解码。换行由 extract_meta 的 splitlines 处理，无需文本层的换行转换。
+
+    只在缓存未命中时调用：(mtime_ns, size) 未变的文件在 collect_notes 中根本不会被读取。
+    """
+    with open(path, "rb", buffering=0) as f:
+        return f.read().decode("utf-8")
+
+
+def _process_one(idx_path: tuple[int, Path], use_cache: bool = True) -> tuple[Note, Optional[str]]:
+    """读取并解析单个 Markdown 文件（需位于模块顶层，供进程池 pickle）。
+
+    返回 Note 以及正文 HTML 的缓存键；``use_cache=False`` 时绕过磁盘缓存，键为 None。
+    """
+    idx, md_path = idx_path
+    raw_text = read_markdown(md_path)
+    meta, body_lines, first_paragraph = extract_meta(raw_text, md_path)
+    title: str = meta.get("title", md_path.stem)
+    date_display: str = meta.get("date", "未注明日期")
+    tags: List[str] = meta.get("tags", [])
+    summary: str = meta.get("summary", "")
+    category: str = meta.get("category", "basics")  # 默认分类为 basics
+
+    # 已在 front matter 或引用行中给出摘要时，首段无需再去标记
+    if not summary:
+        clean_summary = strip_markdown(first_paragraph).strip().replace("\n", " ")
+        summary = clean_summary[:140] + "…" if len(clean_summary) > 140 else clean_summary
+
+    # 使用文件名作为 slug 的基础，避免标题 slug 冲突
+    slug = slugify(md_path.stem, fallback_seed=title, sequence=idx)
+
+    # 构建展现用的 meta 信息（在正文最前面显示）
+    if use_cache:
+        html_body, html_key = cached_markdown_to_html(body_lines)
+    else:
+        html_body, html_key = markdown_to_html(body_lines), None
+
+    note = Note(
+        title=title,
+        date_display=date_display,
+        summary=summary,
+        tags=tags,
+        slug=slug,
+        html_body=html_body,
+        category=category,
+    )
+    return note, html_key
+
+
+def _usable_cpus() -> int:
+    """本进程可用的 CPU 数。os.cpu_count() 不考虑 CPU 亲和性与容器限制，能取到亲和性时以它为准。"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _intern_note_meta(note: Note) -> Note:
+    """日期、标签、分类在文章之间大量重复，驻留后相同文本只保留一份对象。
+
+    进程池返回的 Note 经过 pickle、缓存复用的 Note 来自 JSON，都是新分配的字符串，
+    因此在 collect_notes 汇总时统一处理。front matter 可能写出非字符串的值，只驻留 str。
+    """
+    if type(note.date_display) is str:
+        note.date_display = sys.intern(note.date_display)
+    if type(note.category) is str:
+        note.category = sys.intern(note.category)
+    if type(note.tags) is list:
+        note.tags = [sys.intern(t) if type(t) is str else t for t in note.tags]
+    return note
+
+
+def collect_notes(
+    cache: Optional[dict] = None,
+    use_cache: bool = True,
+    jobs: Optional[int] = None,
+    reused: Optional[set] = None,
+    changed: Optional[set] = None,
+) -> List[Note]:
+    """收集全部文章。
+
+    传入 ``cache``（见 ``load_note_cache``）时，(mtime_ns, size) 未变的文件直接复用缓存的
+    Note，不再解析；``cache`` 会被原地更新为本次的结果，由调用方负责写回。
+    收集结束后清理本次未用到的正文 HTML 缓存；``use_cache=False`` 时不读写正文 HTML 缓存。
+    ``jobs`` 为解析进程数：None 表示文件较多且可用 CPU 不止一个时按可用 CPU 数并行，1 表示始终串行。
+    传入集合 ``reused`` 时，直接复用缓存、且上次构建中 slug 没有与其他文章重复的文章 slug 会被加入其中
+    （上次共用 slug 时磁盘上的页面可能是另一篇写的，不能当作未变）。
+    传入文件名集合 ``changed`` 时只重新解析其中的文件，其余文件有缓存就直接复用、不再比较 stat。
+    """
     if not MARKDOWN_DIR.exists():
         print(f"未找到目录：{MARKDOWN_DIR}", file=sys.stderr)
         return []
 
-    notes: List[Note] = []
-    all_paths = sorted(MARKDOWN_DIR.glob("*.md")) + sorted(MARKDOWN_DIR.glob("*.markdown"))
-    for idx, md_path in enumerate(all_paths, start=1):
-        raw_text = md_path.read_text(encoding="utf-8")
-        meta, body_raw = extract_meta(raw_text, md_path)
-        title: str = meta.get("title", md_path.stem)
-        date_display: str = meta.get("date", "未注明日期")
-        tags: List[str] = meta.get("tags", [])
-        summary: str = meta.get("summary", "")
-        category: str = meta.get("category", "basics")  # 默认分类为 basics
-
-        body_lines = body_raw.splitlines()
-        summary_lines = []
-        for line in body_lines:
-            stripped = line.strip()
-            if not stripped or stripped.startswith(">"):
-                summary_lines.append("")
-                continue
-            if stripped.startswith("#"):
-                summary_lines.append("")
-                continue
-            summary_lines.append(line)
+    # 一次目录扫描同时筛出 .md / .markdown，按文件名排序
+    with os.scandir(MARKDOWN_DIR) as it:
+        entries = [e for e in it if e.is_file() and e.name.endswith(MARKDOWN_SUFFIXES)]
+    entries.sort(key=lambda e: e.name)
 
-        body_for_summary = "\n".join(summary_lines)
-        paragraphs = [seg.strip() for seg in re.split(r"\n\s*\n", body_for_summary) if seg.strip()]
-        plain_text = strip_markdown(paragraphs[0] if paragraphs else body_for_summary)
-        if not summary:
-            clean_summary = plain_text.strip().replace("\n", " ")
-            summary = clean_summary[:140] + "…" if len(clean_summary) > 140 else clean_summary
-
-        # 使用文件名作为 slug 的基础，避免标题 slug 冲突
-        slug = slugify(md_path.stem, fallback_seed=title, sequence=idx)
-        body_without_meta = []
-        for line in body_lines:
-            stripped = line.strip()
-            if stripped.startswith(">") and any(key in stripped for key in ["date", "tags", "title"]):
-                continue
-            body_without_meta.append(line)
-
-        body_clean = "\n".join(body_without_meta).strip()
-
-        # 构建展现用的 meta 信息（在正文最前面显示）
-        html_body = markdown_to_html(body_clean)
-
-        notes.append(
-            Note(
-                title=title,
-                date_display=date_display,
-                summary=summary,
-                tags=tags,
-                slug=slug,
-                html_body=html_body,
-                category=category,
-            )
-        )
-    notes.sort(reverse=True)
+    previous = cache if cache is not None else {}
+    previous_slug_counts = collections.Counter(
+        entry[1]["slug"] for entry in previous.values() if entry and entry[1]
+    )
+    fresh_cache: dict = {}
+    cached_notes: dict[int, Note] = {}
+    pending: List[tuple[int, Path]] = []
+    for idx, dir_entry in enumerate(entries, start=1):
+        # 命中缓存时只用到 DirEntry 自带的文件名与 stat，需要解析时才构造 Path
+        name = dir_entry.name
+        stat = dir_entry.stat()
+        key = [stat.st_mtime_ns, stat.st_size]
+        entry = previous.get(name)
+        trusted = changed is not None and name not in changed
+        if entry and entry[1] and (entry[0] == key or trusted):
+            cached_notes[idx] = _intern_note_meta(Note(**entry[1]))
+            fresh_cache[name] = entry
+            if reused is not None and previous_slug_counts[cached_notes[idx].slug] == 1:
+                reused.add(cached_notes[idx].slug)
+        else:
+            pending.append((idx, Path(dir_entry.path)))
+            fresh_cache[name] = [key, None, None]
+
+    # 各文件互不依赖，文件较多时用多进程并行解析；文件很少时进程启动开销不划算
+    process = functools.partial(_process_one, use_cache=use_cache)
+    workers = jobs or _usable_cpus()
+    serial = workers < 2 or (jobs is None and len(pending) < PARALLEL_THRESHOLD)
+    if serial or len(pending) < 2:
+        parsed = [process(item) for item in pending]
+    else:
+        # 每个进程大约分到 4 批，文章越多单批越大，减少进程间来回传递的次数
+        chunksize = max(1, len(pending) // (workers * 4))
+        # 进程池会拉起 multiprocessing，只在真正并行解析时才导入
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # 支持 fork 的平台直接 fork：子进程继承已编译的正则与已导入的模块，不必逐个重新导入脚本；
+        # Windows 等没有 fork 的平台沿用默认的 spawn
+        mp_context = None
+        if "fork" in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            parsed = list(executor.map(process, pending, chunksize=chunksize))
+    for (idx, md_path), (note, html_key) in zip(pending, parsed):
+        cached_notes[idx] = _intern_note_meta(note)
+        fresh_cache[md_path.name][1:] = [note_to_dict(note), html_key]
+    if use_cache:
+        prune_html_cache({entry[2] for entry in fresh_cache.values()})
+
+    if cache is not None:
+        cache.clear()
+        cache.update(fresh_cache)
+
+    notes = [cached_notes[idx] for idx in sorted(cached_notes)]
+    notes.sort(key=note_sort_key, reverse=True)
     return notes
 
 
 def render_note(note: Note) -> str:
-    tags_html = "，".join(note.tags) if note.tags else "暂无标签"
-    meta_line = f"{note.date_display} · {tags_html}"
-
     return f"""
-        <article class=\"article-card\" id=\"{html.escape(note.slug)}\">
+        <article class=\"article-card\" id=\"{note.escaped_slug}\">
           <header class=\"article-card__header\">
-            <h3>{html.escape(note.title)}</h3>
-            <p class=\"article-card__meta\">{html.escape(meta_line)}</p>
+            <h3>{note.escaped_title}</h3>
+            <p class=\"article-card__meta\">{note.escaped_meta_line}</p>
           </header>
-          <p class=\"article-card__summary\">{html.escape(note.summary)}</p>
+          <p class=\"article-card__summary\">{note.escaped_summary}</p>
           <div class=\"article-card__actions\">
-            <a class=\"article-card__link\" href=\"notes/{html.escape(note.slug)}.html\">阅读全文</a>
+            <a class=\"article-card__link\" href=\"notes/{note.escaped_slug}.html\">阅读全文</a>
           </div>
         </article>""".strip()
 
 
-def indent_lines(text: str, spaces: int) -> str:
-    indent = " " * spaces
-    return "\n".join(f"{indent}{line}" if line else "" for line in text.splitlines())
-
-
 def build_article_html(notes: List[Note]) -> str:
     if not notes:
         return "        <p class=\"empty-state\">暂时还没有内容，欢迎稍后再来。</p>"
 
-    rendered = [textwrap.indent(render_note(note), "        ") for note in notes]
-    return "\n".join(rendered)
+    # 卡片 HTML 没有空行，先拼接全部卡片，再用一次 str.replace 统一缩进
+    return "        " + "\n".join([render_note(note) for note in notes]).replace("\n", "\n        ")
 
 
-def render_note_detail_page(note: Note, combined_body_html: str, meta_line: str) -> str:
-    """渲染文章详情页 HTML"""
-    category = note.category if note.category in CATEGORY_MAP else "basics"
+@functools.lru_cache(maxsize=None)
+def get_note_page_template(category: str) -> str:
+    """按板块生成并缓存详情页模板，仅保留 title / hero_title / meta_line / body 占位符。"""
     html_file, page_title, hero_class, badge = CATEGORY_MAP[category]
 
-    nav_config = [
-        ("../index.html", "首页", None),
-        ("../papers.html", CATEGORY_MAP["papers"][1], "papers"),
-        ("../pathways-methods.html", CATEGORY_MAP["pathways"][1], "pathways"),
-        ("../basics.html", CATEGORY_MAP["basics"][1], "basics"),
-        ("../stories-evolution.html", CATEGORY_MAP["stories"][1], "stories"),
-        ("../contact.html", "联系我", None),
-    ]
     nav_links = []
-    for href, label, key in nav_config:
+    for href, label, key in NOTE_NAV_LINKS:
         active_class = ' class="active"' if key == category else ""
         nav_links.append(f'      <a href="{href}"{active_class}>{label}</a>')
     nav_html = "\n".join(nav_links)
-
-    back_text_map = {
-        "basics": "← 返回基础概念列表",
-        "papers": "← 返回论文拆解列表",
-        "pathways": "← 返回通路与方法区列表",
-        "stories": "← 返回人类演化 & 疾病小随笔列表",
-    }
-    back_text = back_text_map.get(category, "← 返回列表")
-
-    body_indented = textwrap.indent(combined_body_html.strip(), "        ")
+    back_text = BACK_TEXT_MAP.get(category, "← 返回列表")
 
     return f"""<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
   <meta charset="UTF-8">
   <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>{html.escape(note.title)} - {page_title}</title>
+  <title>{{title}} - {page_title}</title>
   <link rel="preconnect" href="https://fonts.googleapis.com">
   <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
   <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;600;700&display=swap" rel="stylesheet">
@@ -567,8 +853,8 @@ def render_note_detail_page(note: Note, combined_body_html: str, meta_line: str)
     <section class="hero hero-sub {hero_class}">
       <div class="hero-copy">
         <span class="badge">{badge}</span>
-        <h1>{html.escape(note.title.split(" ")[0] if " " in note.title else note.title)}</h1>
-        <p class="article-detail__meta">{html.escape(meta_line)}</p>
+        <h1>{{hero_title}}</h1>
+        <p class="article-detail__meta">{{meta_line}}</p>
         <a class="article-detail__back" href="../{html_file}">{back_text}</a>
       </div>
       <div class="hero-illustration hero-illustration--mini" aria-hidden="true">
@@ -579,7 +865,7 @@ def render_note_detail_page(note: Note, combined_body_html: str, meta_line: str)
 
     <section class="section article-detail">
       <article class="article-detail__card">
-{body_indented}
+{{body}}
       </article>
     </section>
   </main>
@@ -596,34 +882,202 @@ def render_note_detail_page(note: Note, combined_body_html: str, meta_line: str)
 """
 
 
-def write_note_pages(notes: List[Note]) -> None:
+# textwrap.indent 按 splitlines 断行且跳过空白行；含这些字符或空白行时才需要逐行处理
+INDENT_SLOW_PATTERN = re.compile(r"[\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]|(?:\A|\n)[^\S\n]*(?:\n|\Z)")
+
+
+def indent_block(text: str, prefix: str) -> str:
+    """与 ``textwrap.indent(text, prefix)`` 结果相同；常见的无空白行文本直接 str.replace。"""
+    if INDENT_SLOW_PATTERN.search(text):
+        # 逐行处理时也不经过 textwrap 的 predicate 函数调用
+        return "".join([prefix + line if line.strip() else line for line in text.splitlines(True)])
+    return prefix + text.replace("\n", "\n" + prefix)
+
+
+NOTE_PAGE_SLOTS = ("title", "hero_title", "meta_line", "body")
+
+
+@functools.lru_cache(maxsize=None)
+def get_note_page_parts(category: str) -> tuple[str, ...]:
+    """把详情页模板预先拆成静态片段，渲染时与各占位符的值交替拼接，省去每页解析格式串。"""
+    parsed = list(string.Formatter().parse(get_note_page_template(category)))
+    if tuple(name for _, name, _, _ in parsed) != NOTE_PAGE_SLOTS + (None,):
+        raise ValueError("详情页模板的占位符与 NOTE_PAGE_SLOTS 不一致")
+    return tuple(literal for literal, _, _, _ in parsed)
+
+
+def render_note_detail_page(note: Note, combined_body_html: str) -> str:
+    """渲染文章详情页 HTML"""
+    category = note.category if note.category in CATEGORY_MAP else "basics"
+    head, after_title, after_hero, after_meta, tail = get_note_page_parts(category)
+    # 首个空格前的部分作主标题；partition 只切一刀，不必先判断再 split 整串
+    hero_title = _esc(note.title.partition(" ")[0])
+    body_indented = indent_block(combined_body_html.strip(), "        ")
+    return "".join((
+        head, note.escaped_title,
+        after_title, hero_title,
+        after_hero, note.escaped_meta_line,
+        after_meta, body_indented,
+        tail,
+    ))
+
+
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """内容未变时不重写，避免无谓地刷新 mtime；返回是否写入。"""
+    try:
+        # 大小不同必然有变化，先比 stat 的大小，相同时才读出全文比较
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def _remove_stale(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def write_note_pages(notes: List[Note], unchanged: frozenset = frozenset()) -> int:
+    """写出全部详情页并删除已失效的页面，返回实际重写的页面数。
+
+    ``unchanged`` 中的 slug 对应的文章与上次构建相同（缓存签名已涵盖模板），且上次由它独占该 slug，
+    页面已存在时不再渲染比较；本次多篇文章共用一个 slug 时仍按顺序全部渲染。
+    """
     NOTE_OUTPUT_DIR.mkdir(exist_ok=True)
     existing = {path.stem for path in NOTE_OUTPUT_DIR.glob("*.html")}
     current = set()
+    # 多篇文章共用一个 slug 时后渲染的覆盖先渲染的，每个路径只交给线程池写一次，保持串行写出时的结果
+    pages: dict[Path, bytes] = {}
+    slug_counts = collections.Counter(note.slug for note in notes)
 
     for note in notes:
         current.add(note.slug)
-        tags_html = "，".join(note.tags) if note.tags else "暂无标签"
-        meta_line = f"{note.date_display} · {tags_html}"
+        if note.slug in unchanged and note.slug in existing and slug_counts[note.slug] == 1:
+            continue
         detail_path = NOTE_OUTPUT_DIR / f"{note.slug}.html"
         meta_lines = []
         if note.date_display and note.date_display != "未注明日期":
-            meta_lines.append(f"日期：{html.escape(note.date_display)}")
+            meta_lines.append(f"日期：{_esc(note.date_display)}")
         if note.tags:
-            meta_lines.append(f"标签：{html.escape('、'.join(note.tags))}")
+            meta_lines.append(f"标签：{_esc('、'.join(note.tags))}")
 
         meta_html = "\n".join(f"<p class=\"article-detail__meta\">{line}</p>" for line in meta_lines)
         body_html = note.html_body
         combined_body = meta_html + "\n" + body_html if meta_html else body_html
-        detail_html = render_note_detail_page(note, combined_body, meta_line)
-        detail_path.write_text(detail_html, encoding="utf-8")
+        detail_html = render_note_detail_page(note, combined_body)
+        pages[detail_path] = detail_html.encode("utf-8")
 
-    for stale in existing - current:
-        stale_path = NOTE_OUTPUT_DIR / f"{stale}.html"
-        try:
-            stale_path.unlink()
-        except FileNotFoundError:
-            continue
+    stale_paths = [NOTE_OUTPUT_DIR / f"{stale}.html" for stale in existing - current]
+    # 写入与清理都是磁盘 I/O，放进线程池以重叠磁盘延迟
+    with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+        written = sum(executor.map(_write_if_changed, pages.keys(), pages.values()))
+        list(executor.map(_remove_stale, stale_paths))
+    return written
+
+# ---------------------------------------------------------------------------
+# 增量构建缓存
+# ---------------------------------------------------------------------------
+
+
+def note_to_dict(note: Note) -> dict:
+    return {f.name: getattr(note, f.name) for f in fields(Note) if f.init}
+
+
+@functools.lru_cache(maxsize=1)
+def _parser_name() -> str:
+    """当前会用到的解析器及版本。只查找、读取版本号，不导入它，保持全部命中缓存时的启动速度。"""
+    selected = _selected_parser()
+    if selected is None:
+        return "builtin"
+    dist_name = selected[1]
+    # importlib.metadata 导入较慢，只在装了可选解析器时才需要
+    from importlib import metadata
+
+    try:
+        return f"{dist_name} {metadata.version(dist_name)}"
+    except metadata.PackageNotFoundError:  # pragma: no cover
+        return f"{dist_name} unknown"
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_signature() -> str:
+    """构建脚本或 Markdown 解析器变化时，旧缓存整体作废。"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(Path(__file__).read_bytes())
+    digest.update(_parser_name().encode("utf-8"))
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _html_cache_salt() -> bytes:
+    """正文 HTML 缓存键的前缀。
+
+    外部解析器只取名称版本、扩展列表与 HTML_CACHE_VERSION，修改模板等不会让昂贵的转换结果失效；
+    内置解析器就在本脚本中，沿用整体构建签名。
+    """
+    parser_name = _parser_name()
+    if parser_name == "builtin":
+        return _cache_signature().encode("ascii")
+    return f"{parser_name}|{','.join(MARKDOWN_EXTENSIONS)}|{HTML_CACHE_VERSION}".encode("utf-8")
+
+
+def cached_markdown_to_html(lines: List[str]) -> tuple[str, str]:
+    """带磁盘缓存的 ``markdown_to_html``，返回 (html, 缓存键)。
+
+    转换是确定性的，键只取决于正文与解析器配置（见 ``_html_cache_salt``）。
+    """
+    # 只拼接一次正文，哈希与转换共用同一个字符串
+    source = "\n".join(lines)
+    digest = hashlib.blake2b(_html_cache_salt(), digest_size=16)
+    digest.update(source.encode("utf-8"))
+    key = digest.hexdigest()
+    cache_path = HTML_CACHE_DIR / f"{key}.html"
+    try:
+        return cache_path.read_bytes().decode("utf-8"), key
+    except FileNotFoundError:
+        pass
+
+    html_body = markdown_to_html(source)
+    HTML_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # 先写临时文件再原子替换，并行解析的进程之间不会读到半截内容
+    tmp_path = HTML_CACHE_DIR / f"{key}.{os.getpid()}.tmp"
+    tmp_path.write_bytes(html_body.encode("utf-8"))
+    tmp_path.replace(cache_path)
+    return html_body, key
+
+
+def prune_html_cache(used_keys: set) -> None:
+    """删除本次构建未用到的正文 HTML 缓存。"""
+    if not HTML_CACHE_DIR.is_dir():
+        return
+    for path in HTML_CACHE_DIR.glob("*.html"):
+        if path.stem not in used_keys:
+            _remove_stale(path)
+
+
+def load_note_cache() -> dict:
+    try:
+        data = _json_loads(CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("signature") != _cache_signature():
+        return {}
+    return data.get("notes", {})
+
+
+def save_note_cache(cache: dict) -> None:
+    CACHE_DIR.mkdir(exist_ok=True)
+    payload = {"signature": _cache_signature(), "notes": cache}
+    if orjson is not None:
+        data = orjson.dumps(payload)
+    else:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    CACHE_FILE.write_bytes(data)
+    _remove_stale(LEGACY_CACHE_FILE)
 
 # ---------------------------------------------------------------------------
 # 占位符替换
@@ -634,27 +1088,54 @@ def update_section(target: Path, start_marker: str, end_marker: str, content: st
     if not target.exists():
         raise FileNotFoundError(f"未找到文件：{target}")
 
-    html_text = target.read_text(encoding="utf-8")
-    start_idx = html_text.find(start_marker)
-    end_idx = html_text.find(end_marker)
+    # 全程按字节处理，省去整页的解码与再编码；换行统一为 \n，与文本模式读写的结果一致
+    html_bytes = target.read_bytes()
+    if b"\r" in html_bytes:
+        html_bytes = html_bytes.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    start_bytes = start_marker.encode("utf-8")
+    start_idx = html_bytes.find(start_bytes)
+    end_idx = html_bytes.find(end_marker.encode("utf-8"))
 
     if start_idx == -1 or end_idx == -1 or end_idx < start_idx:
         raise ValueError(f"{target.name} 中未找到有效的占位符注释")
 
-    new_html = (
-        html_text[: start_idx + len(start_marker)]
-        + "\n"
-        + content
-        + "\n"
-        + html_text[end_idx:]
-    )
-    target.write_text(new_html, encoding="utf-8")
+    # 占位符之间的内容没变就不写回，避免刷新 mtime 触发预览服务重载
+    content_bytes = b"\n" + content.encode("utf-8") + b"\n"
+    prefix_end = start_idx + len(start_bytes)
+    if html_bytes[prefix_end:end_idx] == content_bytes:
+        return
+
+    target.write_bytes(b"".join((html_bytes[:prefix_end], content_bytes, html_bytes[end_idx:])))
 
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
 
+def changed_since(ref: str) -> set:
+    """返回相对 git 提交 ``ref``（含工作区改动）有变化的 Markdown 文件名。"""
+    result = subprocess.run(
+        ["git", "-C", str(BASE_DIR), "diff", "--name-only", "--relative", "-z", ref, "--", MARKDOWN_DIR.name],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"git diff 执行失败：{result.stderr.decode('utf-8', 'replace').strip()}")
+    paths = result.stdout.decode("utf-8", "surrogateescape").split("\0")
+    return {Path(path).name for path in paths if path}
+
+
+def names_for_slug(slug: str, cache: dict) -> set:
+    """按 slug 找到对应的 Markdown 文件名：缓存里记录的 slug，或由文件名直接得到的 slug。"""
+    names = {name for name, entry in cache.items() if entry[1] and entry[1]["slug"] == slug}
+    if MARKDOWN_DIR.exists():
+        with os.scandir(MARKDOWN_DIR) as it:
+            names.update(
+                e.name for e in it
+                if e.name.endswith(MARKDOWN_SUFFIXES) and _normalize_slug(Path(e.name).stem) == slug
+            )
+    return names
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="构建随笔页面")
     parser.add_argument(
@@ -662,9 +1143,67 @@ def main() -> None:
         action="store_true",
         help="仅打印生成的 HTML，不写回 notes.html",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="忽略并不写入所有缓存，完整重新解析",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="解析 Markdown 的进程数，1 表示串行；默认文章较多时按 CPU 核数并行",
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="只重新解析相对该 git 提交有改动的文章，其余文章复用缓存",
+    )
+    parser.add_argument(
+        "--only",
+        metavar="SLUG",
+        action="append",
+        help="只重新解析指定 slug 的文章（可重复），其余文章复用缓存",
+    )
     args = parser.parse_args()
-
-    notes = collect_notes()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs 必须是正整数")
+    partial = bool(args.changed_since or args.only)
+    if args.no_cache and partial:
+        parser.error("--changed-since / --only 要复用缓存，不能与 --no-cache 同时使用")
+
+    if args.no_cache:
+        _convert_markdown_cached.cache_clear()
+        cache = None
+    else:
+        cache = load_note_cache()
+    changed: Optional[set] = None
+    if partial and cache:
+        changed = changed_since(args.changed_since) if args.changed_since else set()
+        for slug in args.only or []:
+            names = names_for_slug(slug, cache)
+            if not names:
+                parser.error(f"未找到 slug 为 {slug} 的文章")
+            changed |= names
+    elif partial:
+        # 没有可复用的索引（首次构建或脚本、解析器已变），只能完整重建；git 提交仍先校验
+        if args.changed_since:
+            changed_since(args.changed_since)
+        print("没有可复用的构建缓存，本次完整重建", file=sys.stderr)
+    reused: set = set()
+    notes = collect_notes(
+        cache,
+        use_cache=not args.no_cache,
+        jobs=args.jobs,
+        reused=reused,
+        changed=changed,
+    )
+    if partial and changed is None and args.only:
+        # 没有索引时查不到由标题得到的 slug，解析完再核对，写出任何页面之前报错
+        missing = set(args.only) - {note.slug for note in notes}
+        if missing:
+            parser.error(f"未找到 slug 为 {'、'.join(sorted(missing))} 的文章")
     
     # 按 category 分组
     notes_by_category: dict[str, List[Note]] = {}
@@ -675,6 +1214,7 @@ def main() -> None:
         notes_by_category[category].append(note)
     
     # 为每个板块生成文章列表
+    section_jobs: List[tuple[Path, str]] = []
     for category, (html_file, _, _, _) in CATEGORY_MAP.items():
         category_notes = notes_by_category.get(category, [])
         article_html = build_article_html(category_notes)
@@ -686,16 +1226,30 @@ def main() -> None:
         
         target_file = BASE_DIR / html_file
         if target_file.exists():
-            update_section(target_file, PLACEHOLDER_START, PLACEHOLDER_END, article_html)
+            section_jobs.append((target_file, article_html))
     
     if args.dry_run:
         return
     
-    write_note_pages(notes)
+    # 各列表页互不依赖，并发写出；任一列表页失败（如缺少占位符）都先抛出，不再写详情页，
+    # 与逐个写出时一样在动详情页之前中止构建
+    with ThreadPoolExecutor(max_workers=max(1, len(section_jobs))) as executor:
+        futures = [
+            executor.submit(update_section, target_file, PLACEHOLDER_START, PLACEHOLDER_END, article_html)
+            for target_file, article_html in section_jobs
+        ]
+        for future in futures:
+            future.result()
+    regenerated = write_note_pages(notes, frozenset(reused))
+    if cache is not None:
+        save_note_cache(cache)
+    else:
+        # 完整重建不更新索引；旧索引记录的页面归属已不可信，删掉让下次构建重新解析
+        _remove_stale(CACHE_FILE)
     
     # 统计输出
     stats = ", ".join([f"{cat}: {len(notes_by_category.get(cat, []))}" for cat in CATEGORY_MAP.keys()])
-    print(f"已处理 {len(notes)} 篇文章，按板块分布：{stats}")
+    print(f"已处理 {len(notes)} 篇文章，按板块分布：{stats}；重新生成详情页 {regenerated}/{len(notes)} 篇")
 
 
 if __name__ == "__main__":